@@ -2,6 +2,8 @@
 
 import logging
 import os
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as _dist_version
 
 
 __LOG_LEVEL_MAP = {
@@ -41,10 +43,9 @@ except ImportError:
     NB_SHELL = False
     _LOGGER.warning("'IPython' is not installed")
 finally:
-    import pkg_resources
     try:
-        pkg_resources.get_distribution('tqdm')
-    except pkg_resources.DistributionNotFound:
+        _dist_version('tqdm')
+    except PackageNotFoundError:
         TQDM_INSTALLED = False
         _LOGGER.warning("'tqdm' is not installed")
     else:
@@ -59,7 +60,7 @@ from archappl.client import *
 from archappl.data import *
 
 
-__version__ = '0.10.7'
+from ._version import __version__
 __author__ = 'Tong Zhang <zhangt@frib.msu.edu>'
 
 __doc__ ="""archappl: Python interface of Archiver Appliance."""
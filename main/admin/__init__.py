@@ -1 +1,2 @@
 from .client import ArchiverMgmtClient
+from .client import PVStatus
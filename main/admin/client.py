@@ -0,0 +1,499 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import requests
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import TYPE_CHECKING, Any, Union
+from types import SimpleNamespace
+
+from archappl.config import SITE_ADMIN_URL
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+# the maximum number of concurrent requests for a list of PVs
+MAX_WORKERS = 16
+# the maximum number of cached responses per client
+CACHE_MAXSIZE = 500
+# seconds before a cached response expires, by BPL endpoint, None never expires
+CACHE_TTL = {
+    'getApplianceInfo': None,
+    'getPVTypeInfo': 60,
+    'getStoresForPV': 60,
+    'getPVDetails': 300,
+}
+
+
+class PVStatus(object):
+    """Archiving status of a PV, as returned by *getPVStatus*.
+
+    The fields known to the archiver appliance are stored in slots, the other
+    ones (if any) are kept in the instance dict, so ``vars()`` only returns the
+    latter, use `to_dict` to get all the fields.
+    """
+    _FIELDS = (
+        'pvName', 'pvNameOnly', 'status', 'appliance', 'connectionState',
+        'lastEvent', 'lastRotateLogs', 'samplingPeriod', 'isMonitored',
+        'connectionFirstEstablished', 'connectionLastRestablished',
+        'connectionLossRegainCount',
+    )
+    __slots__ = _FIELDS + ('__dict__',)
+
+    def __init__(self, **kws):
+        for k, v in kws.items():
+            setattr(self, k, v)
+
+    def to_dict(self) -> dict:
+        """Return the status fields as a dict.
+        """
+        d = {k: getattr(self, k) for k in self._FIELDS if hasattr(self, k)}
+        d.update(self.__dict__)
+        return d
+
+    def __eq__(self, other):
+        if not isinstance(other, PVStatus):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return "PVStatus({})".format(
+                ', '.join(f"{k}={v!r}" for k, v in self.to_dict().items()))
+
+
+class ArchiverMgmtClient(object):
+    """Management client for Archiver Appliance.
+
+    Parameters
+    ----------
+    url : str
+        Base url of BPL, defaults the one defined in config.ini file:
+        1. ~/.pyarchappl/config.ini
+        2. /etc/pyarchappl/config.ini
+        otherwise, fallbacks to one deployed with the package.
+    cache : bool
+        If cache the responses of the metadata endpoints, default is True.
+    """
+    # BPL endpoints, the full URLs are built when setting url
+    _ENDPOINTS = (
+        'getApplianceInfo', 'getAllPVs', 'getAllExpandedPVNames',
+        'getPVStatus', 'getPVTypeInfo', 'getPVDetails', 'getStoresForPV',
+        'archivePV', 'pauseArchivingPV', 'resumeArchivingPV',
+        'abortArchivingPV', 'changeArchivalParameters',
+    )
+    # archive operation: BPL endpoint
+    _OP_ENDPOINT = {
+        None: 'archivePV',
+        'archive': 'archivePV',
+        'pause': 'pauseArchivingPV',
+        'resume': 'resumeArchivingPV',
+        'abort': 'abortArchivingPV',
+        'update': 'changeArchivalParameters',
+    }
+    # archive operations which accept extra keyword arguments
+    _OP_TAKES_KWS = {None, 'archive', 'update'}
+    # archive operations which accept a list of PVs through a single POST request
+    _OP_BATCH = {None, 'archive', 'pause', 'resume'}
+
+    def __init__(self, url: Union[str, None] = None, cache: bool = True):
+        self.url = url
+        self._use_cache = cache
+        # keep-alive connections shared by all the requests of this client
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        # the default Accept-Encoding of requests already includes every
+        # encoding urllib3 can decode, e.g. 'br' if brotli is installed.
+        self._session.headers.update({'Accept': 'application/json'})
+        # cached (timestamp, response) of the metadata endpoints, keyed by (endpoint url, pv)
+        self._cache: OrderedDict[tuple[str, Union[str, None]], tuple[float, Any]] = OrderedDict()
+        # the client could be shared by threads
+        self._cache_lock = threading.Lock()
+
+    @property
+    def url(self):
+        """str: URL of archiver appliance (management).
+        """
+        return self._url
+    
+    @url.setter
+    def url(self, url: Union[str, None]):
+        if url is None:
+            url = SITE_ADMIN_URL
+        self._url = url + '/mgmt/bpl'
+        self._ep = {ep: f"{self._url}/{ep}" for ep in self._ENDPOINTS}
+
+    def get_session(self) -> requests.Session:
+        """Return the HTTP session used by this client, e.g. to mount adapters
+        with a retry policy.
+        """
+        return self._session
+
+    def close(self):
+        """Close the HTTP session and release the pooled connections.
+        """
+        self._session.close()
+
+    def invalidate(self, pv: Union[str, None] = None):
+        """Drop the cached metadata of the given PV, or all the cached
+        responses if *pv* is not defined.
+        """
+        with self._cache_lock:
+            if pv is None:
+                self._cache.clear()
+            else:
+                for k in [k for k in self._cache if k[1] == pv]:
+                    del self._cache[k]
+
+    def cache_info(self) -> dict[tuple[str, Union[str, None]], float]:
+        """Return the cached entries, keyed by (endpoint url, pv), with the
+        timestamp when each one was captured.
+        """
+        with self._cache_lock:
+            return {k: v[0] for k, v in self._cache.items()}
+
+    def _get_cached(self, key: tuple, ttl: Union[float, None] = None):
+        # return the cached response or None, if not cached or older than ttl
+        with self._cache_lock:
+            item = self._cache.get(key)
+            if item is None:
+                return None
+            if ttl is not None and time.time() - item[0] > ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return item[1]
+
+    def _set_cached(self, key: tuple, r: Any):
+        # cache the response, drop the least recently used one if full
+        if not self._use_cache:
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.time(), r)
+            if len(self._cache) > CACHE_MAXSIZE:
+                self._cache.popitem(last=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_appliance_info(self):
+        """Get the appliance information for the specified appliance, the
+        result is cached, a copy of the cached one is returned.
+        """
+        url = self._ep['getApplianceInfo']
+        key = (url, None)
+        r = self._get_cached(key, CACHE_TTL['getApplianceInfo'])
+        if r is None:
+            r = _loads(self._session.get(url).content)
+            self._set_cached(key, r)
+        return dict(r)
+    
+    def get_all_pvs(self, pv: str, limit: int = 10, **kws):
+        """Get the PVs in the cluster, return empty list if not being archived.
+
+        Parameters
+        ----------
+        pv : str
+            Only return PVs matched `pv` pattern (unix wildcard).
+        limit : int
+            Length of returned list of PVs, default is 10.
+
+        Keyword Arguments
+        -----------------
+        expanded : bool
+            If true, return ALL PV with all fields, caution it may return a huge amount data.
+
+        Returns
+        -------
+        r : list[str]
+            A list of PV names
+        """
+        if kws.pop("expanded", False):
+            url = self._ep['getAllExpandedPVNames']
+        else:
+            url = self._ep['getAllPVs']
+        kws.update({'pv': pv, 'limit': limit})
+        with self._session.get(url, params=kws, stream=True) as r:
+            return _read_json(r)
+
+    def get_pv_status(self, pv: Union[str, list[str]], max_workers: int = MAX_WORKERS,
+                      **kws) -> dict[str, 'PVStatus']:
+        """Get the status of a PV.
+
+        Parameters
+        ----------
+        pv : list[str], str
+            A PV name or String pattern (unix wildcard) or a list of PV names/patterns,
+            for the latter, the status of each is requested concurrently.
+        max_workers : int
+            The maximum number of concurrent requests for a list of PVs,
+            defaults to `MAX_WORKERS`.
+
+        Returns
+        -------
+        r : dict[str, PVStatus]
+            A dict of PV status, PV names as the keys.
+        """
+        url = self._ep['getPVStatus']
+        if isinstance(pv, str):
+            kws.update({'pv': pv})
+            r = _loads(self._session.get(url, params=kws).content)
+            return {i['pvName']: PVStatus(**i) for i in r}
+        else:  # a list of pv string patterns, request concurrently
+            # each concurrent request needs its own params, cannot share a mutated dict
+            def _get(_pv: str) -> list[dict]:
+                return _loads(self._session.get(url, params={**kws, 'pv': _pv}).content)
+
+            pv_status: dict = {}
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pv)))) as executor:
+                for r in executor.map(_get, pv):
+                    pv_status.update({i['pvName']: PVStatus(**i) for i in r})
+            return pv_status
+
+    async def aget_pv_status(self, pv: Union[str, list[str]], **kws) -> dict[str, 'PVStatus']:
+        """Get the status of PVs concurrently with asyncio, the coroutine version of
+        `get_pv_status`, which requires the package *aiohttp*.
+
+        Parameters
+        ----------
+        pv : list[str], str
+            A PV name or String pattern (unix wildcard) or a list of PV names/patterns.
+
+        Returns
+        -------
+        r : dict[str, PVStatus]
+            A dict of PV status, PV names as the keys.
+
+        Examples
+        --------
+        >>> import asyncio
+        >>> client = ArchiverMgmtClient()
+        >>> r = asyncio.run(client.aget_pv_status(['TST:constant', 'TST:uniformNoise']))
+        """
+        import aiohttp
+        if isinstance(pv, str):
+            pv = [pv]
+        url = self._ep['getPVStatus']
+        # aiohttp does not accept None or bool as query values
+        params = {k: str(v) for k, v in kws.items() if v is not None}
+        semaphore = asyncio.Semaphore(MAX_WORKERS)
+        connector = aiohttp.TCPConnector(limit=MAX_WORKERS, keepalive_timeout=60)
+
+        async with aiohttp.ClientSession(connector=connector,
+                                         headers={'Accept': 'application/json'}) as session:
+            async def _get(_pv: str) -> list[dict]:
+                async with semaphore:
+                    async with session.get(url, params={**params, 'pv': _pv}) as r:
+                        return _loads(await r.read())
+
+            rs = await asyncio.gather(*(_get(i) for i in pv))
+        return {i['pvName']: PVStatus(**i) for r in rs for i in r}
+
+    def get_pv_type_info(self, pv: str) -> Union[SimpleNamespace, None]:
+        """Get the type info for a given PV.
+        
+        In the archiver appliance terminology, the *PVTypeInfo* contains the
+        various archiving parameters for a PV.
+
+        The result is cached for 60 seconds once the PV is found, a copy of
+        the cached one is returned, see also `invalidate`.
+
+        Parameters
+        ----------
+        pv : str
+            A PV name.
+
+        Returns
+        -------
+        r : SimpleNamespace or None
+            PV type info or None.
+        """
+        url = self._ep['getPVTypeInfo']
+        key = (url, pv)
+        info = self._get_cached(key, CACHE_TTL['getPVTypeInfo'])
+        if info is None:
+            r = self._session.get(url, params={'pv': pv})
+            if not r.ok:
+                return None
+            info = SimpleNamespace(**_loads(r.content))
+            self._set_cached(key, info)
+        # a copy, changing the result does not touch the cached one
+        return SimpleNamespace(**vars(info))
+
+    def get_pv_details(self, pv: str) -> Union['pd.DataFrame', None]:
+        """ Get the details of a PV.
+
+        The result is cached for 5 minutes once the PV is found, a copy of
+        the cached one is returned, see also `invalidate`.
+
+        Parameters
+        ----------
+        pv : str
+            A PV name.
+
+        Returns
+        -------
+        r : pd.DataFrame or None
+            PV details or None.
+        """
+        url = self._ep['getPVDetails']
+        key = (url, pv)
+        df = self._get_cached(key, CACHE_TTL['getPVDetails'])
+        if df is not None:
+            return df.copy()
+        import pandas as pd
+        with self._session.get(url, params={'pv': pv}, stream=True) as r:
+            if not r.ok:
+                return None
+            data = _read_json(r)
+        if not data:
+            return None
+        # build the columns directly from the records
+        keys = dict.fromkeys(k for d in data for k in d)
+        df = pd.DataFrame({k: [d.get(k) for d in data] for k in keys})
+        df.set_index(['source', 'name'], inplace=True)
+        self._set_cached(key, df)
+        return df.copy()
+
+    def archive_pv(self, pv: Union[str, list[str]], op: str = None, **kws):
+        """Archive operations for one PV or a list of PVs.
+
+        For a list of PVs, duplicated names are dropped, 'archive', 'pause' and 'resume'
+        are done through a single POST request, while 'abort' and 'update' are done
+        for each PV, and a list of the responses is returned.
+
+        Parameters
+        ----------
+        pv : str, list[str]
+            One PV name or a list of PV names to be operated.
+        op : str
+            Specific archive operation:
+            * 'archive' (default): start to archive.
+            * 'pause': pause archiving.
+            * 'resume': resume archiving.
+            * 'abort': abort archiving.
+            * 'update': change archiving configuration.
+
+        Keyword Arguments
+        -----------------
+        `archive`
+            samplingperiod:
+                The sampling period to be used. Optional, default value is
+                1.0 seconds.
+            samplingmethod:
+                The sampling method to be used. For now, this is one of SCAN
+                or MONITOR. Optional, default value is MONITOR.
+            controllingPV:
+                The controlling PV for conditional archiving. Optional;
+                if unspecified, we do not use conditional archiving.
+            policy:
+                Override the policy execution process and use this policy
+                instead. Optional; if unspecified, we go thru the normal
+                policy execution process.
+            appliance:
+                If specified (value is the identity of the appliance),
+                the sampling and archiving are done on the specified appliance.
+        `update`
+            samplingmethod, samplingperiod
+        """
+        if op not in self._OP_ENDPOINT:
+            raise ValueError(f"Invalid archive operation: '{op}'")
+        if not isinstance(pv, str):  # a list of pvs
+            pv_list = list(dict.fromkeys(pv))
+            if op not in self._OP_BATCH:
+                return [self.archive_pv(i, op, **kws) for i in pv_list]
+            if op in self._OP_TAKES_KWS:
+                # the same fields as the query of the single PV request: values
+                # as strings, None ones dropped
+                params = {k: str(v) for k, v in kws.items() if v is not None}
+                body = [{'pv': i, **params} for i in pv_list]
+            else:
+                body = pv_list
+            for i in pv_list:
+                self.invalidate(i)
+            url = self._ep[self._OP_ENDPOINT[op]]
+            return _loads(self._session.post(url, json=body).content)
+        kparams = {'pv': pv}
+        url = self._ep[self._OP_ENDPOINT[op]]
+        if op in self._OP_TAKES_KWS:
+            kparams.update(kws)
+        self.invalidate(pv)
+        return _loads(self._session.get(url, params=kparams).content)
+
+    def get_stores_for_pv(self, pv: str) -> Union[SimpleNamespace, None]:
+        """ Gets the names of the data stores for this PV.
+
+        The result is cached for 60 seconds once the PV is found, a copy of
+        the cached one is returned, see also `invalidate`.
+
+        Parameters
+        ----------
+        pv : str
+            A PV name.
+
+        Returns
+        -------
+        r : SimpleNamespace or None
+            PV type info or None.
+        """
+        url = self._ep['getStoresForPV']
+        key = (url, pv)
+        stores = self._get_cached(key, CACHE_TTL['getStoresForPV'])
+        if stores is None:
+            r = self._session.get(url, params={'pv': pv})
+            if not r.ok:
+                return None
+            stores = SimpleNamespace(**_loads(r.content))
+            self._set_cached(key, stores)
+        return SimpleNamespace(**vars(stores))
+
+    # def delete_pv(self, pv, delete_data=False):
+    #     """ Stop archiving the specified PV. The PV needs to be paused first.
+    #     """
+    #     url = self.url + '/deletePV'
+    #     return self._session.get(url, params={'deleteData': delete_data, 'pv': pv}).json()
+
+    def __repr__(self):
+        return "[Admin Client] Archiver Appliance on: {url}".format(url=self.url)
+
+
+def _read_json(r: requests.Response):
+    # decode the body of a streamed response from a single read of the raw
+    # stream, skip buffering the chunks as `r.content` does.
+    return _loads(r.raw.read(decode_content=True))
+
+
+if __name__ == '__main__':
+    a = ArchiverMgmtClient()
+    assert str(a) == '[Admin Client] Archiver Appliance on: http://127.0.0.1:17665/mgmt/bpl'
+    # URL
+    assert a.url == 'http://127.0.0.1:17665/mgmt/bpl'
+    
+    # get appliance info
+    print(a.get_appliance_info())
+
+    # get all pvs
+    print(a.get_all_pvs())
+    print(a.get_all_pvs(pv='*fake*'))
+    print(a.get_all_pvs(pv='*aussian*', limit=1))
+
+    # get pv status
+    print(a.get_pv_status())
+
+    # get pv type info
+    print(a.get_pv_type_info(pv='TST:gaussianNoise'))
+
@@ -4,7 +4,7 @@ import logging
 import requests
 import json
 from typing import Union
-from simplejson import JSONDecodeError
+from requests.exceptions import JSONDecodeError
 import pandas as pd
 from .utils import LOCAL_ZONE_NAME
 from .pb import unpack_raw_data
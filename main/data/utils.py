@@ -6,6 +6,7 @@ import dateutil.relativedelta as relativedelta
 import pytz
 import time
 import tzlocal
+from functools import lru_cache
 
 TS_FMT = "%Y-%m-%dT%H:%M:%S.%f"
 LOCAL_ZONE = tzlocal.get_localzone()
@@ -165,13 +166,10 @@ def datetime_with_timezone(date_time, time_zone=None):
     >>> print((dt2_as_utc - dt2_local).total_seconds())
     0.0
     """
-    if time_zone is None:
-        _timezone = LOCAL_ZONE
-    else:
-        _timezone = pytz.timezone(time_zone)
-
+    # only look up the timezone when it is actually needed
     if date_time.tzinfo is not None:
         if time_zone is not None:
+            _timezone = pytz.timezone(time_zone)
             _dt1 = date_time.astimezone(_timezone)
             _dt = _timezone.localize(datetime(_dt1.year, _dt1.month, _dt1.day,
                                               _dt1.hour, _dt1.minute, _dt1.second,
@@ -183,6 +181,7 @@ def datetime_with_timezone(date_time, time_zone=None):
                                               _dt1.hour, _dt1.minute, _dt1.second,
                                               _dt1.microsecond))
     else:
+        _timezone = LOCAL_ZONE if time_zone is None else pytz.timezone(time_zone)
         _dt1 = date_time
         _dt = _timezone.localize(datetime(_dt1.year, _dt1.month, _dt1.day,
                                           _dt1.hour, _dt1.minute, _dt1.second,
@@ -209,6 +208,30 @@ def is_dst(date_time):
         return bool(datetime_with_timezone(date_time).dst())
 
 
+TIME_UNIT_TABLE = {'years': 'years', 'months': 'months', 'weeks': 'weeks',
+                   'days': 'days', 'hours': 'hours', 'minutes': 'minutes',
+                   'seconds': 'seconds', 'microseconds': 'microseconds',
+                   'year': 'years', 'month': 'months', 'week': 'weeks',
+                   'day': 'days', 'hour': 'hours', 'minute': 'minutes',
+                   'second': 'seconds', 'microsecond': 'microseconds',
+                   'min': 'minutes', 'sec': 'seconds',
+                   'msec': 'microseconds', 'mins': 'minutes',
+                   'secs': 'seconds', 'msecs': 'microseconds'}
+
+
+@lru_cache(maxsize=256)
+def _parse_dt_spec(dt: str) -> tuple[bool, relativedelta.relativedelta]:
+    # parse the plain English delta time string, e.g. '1 hour and 30 mins before',
+    # return if it is retrospective and the time difference.
+    is_retro = 'before' in dt
+    dt_dict = {}
+    dt_tuple = dt.replace('after', '').replace('and', ',').replace('before', ',').strip(' ,').split(',')
+    for part in dt_tuple:
+        v, k = part.strip().split()
+        dt_dict[TIME_UNIT_TABLE[k]] = int(v)
+    return is_retro, relativedelta.relativedelta(**dt_dict)
+
+
 # see phantasy.parse_dt
 def parse_dt(dt, ref_datetime=None, epoch=None):
     """Parse delta time defined by *dt*, which is presenting in plain English,
@@ -236,8 +259,9 @@ def parse_dt(dt, ref_datetime=None, epoch=None):
 
     Returns
     -------
-    ret : datetime
-        Datetime object with the same tzinfo of reference datetime.
+    ret : datetime or float
+        Datetime object with the same tzinfo of reference datetime, or seconds
+        since Epoch if *epoch* is set.
 
     See Also
     --------
@@ -270,24 +294,7 @@ def parse_dt(dt, ref_datetime=None, epoch=None):
     else:
         raise TypeError("Invalid datetime variable.")
 
-    time_unit_table = {'years': 'years', 'months': 'months', 'weeks': 'weeks',
-                       'days': 'days', 'hours': 'hours', 'minutes': 'minutes',
-                       'seconds': 'seconds', 'microseconds': 'microseconds',
-                       'year': 'years', 'month': 'months', 'week': 'weeks',
-                       'day': 'days', 'hour': 'hours', 'minute': 'minutes',
-                       'second': 'seconds', 'microsecond': 'microseconds',
-                       'min': 'minutes', 'sec': 'seconds',
-                       'msec': 'microseconds', 'mins': 'minutes',
-                       'secs': 'seconds', 'msecs': 'microseconds'}
-
-    is_retro = 'before' in dt
-    dt_dict = {}
-    dt_tuple = dt.replace('after', '').replace('and', ',').replace('before', ',').strip(' ,').split(',')
-    for part in dt_tuple:
-        v, k = part.strip().split()
-        dt_dict[time_unit_table[k]] = int(v)
-
-    dt = relativedelta.relativedelta(**dt_dict)
+    is_retro, dt = _parse_dt_spec(dt)
 
     ref_dt_as_utc = datetime_with_timezone(ref_dt, time_zone='UTC')
     if is_retro:
@@ -296,10 +303,8 @@ def parse_dt(dt, ref_datetime=None, epoch=None):
         _datetime_as_utc = ref_dt_as_utc + dt
     _datetime = datetime_with_timezone(_datetime_as_utc, time_zone=ref_dt.tzinfo.zone)
     if epoch:
-        r = _datetime.timestamp
-    else:
-        r = _datetime
-    return datetime_with_timezone(r)
+        return _datetime.timestamp()
+    return _datetime
 
 
 # see phantasy_ui.printlog
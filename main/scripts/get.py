@@ -8,54 +8,32 @@ $ pyarchappl-get --verbose 1 --pv VA:LS1_CA01:BPM_D1129:X_RD --pv VA:LS1_CA01:BP
                  --from-time 2021-04-15T20:10:00.000Z --to-time 2021-04-15T21:25:00.000Z
                  --resample 1min --url http://127.0.0.1:17665
 """
-from archappl.client import ArchiverDataClient
-from archappl.contrib import get_dataset_with_pvs
-
 import argparse
 import logging
 import sys
 import os
-import json
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+from .utils import get_pv_list
 
 _LOGGER = logging.getLogger(__name__)
 
+# default arguments for the export functions, override with --format-args
+CSV_CHUNKSIZE = 100_000
+# keep the default fixed format of pandas, the table format cannot store
+# the object columns of waveform PVs
+HDF_DEFAULT_ARGS = {'complib': 'blosc', 'complevel': 5}
+
 
 class Formatter(argparse.ArgumentDefaultsHelpFormatter, argparse.RawDescriptionHelpFormatter):
     pass
 
-parser = argparse.ArgumentParser(
-        description="Retrieve data from Archiver Appliance and export as a file.",
-        formatter_class=Formatter)
-parser.add_argument('--url', dest='url', default=None,
-        help="URL of Archiver Appliance, defaults to the one defined in site configuration file.")
-parser.add_argument('--pv', action='append', dest='pv_list',
-        help="List of PVs for retrieval, each define with --pv")
-parser.add_argument('--pv-file', dest='pv_file', default=None,
-        help="A file for PVs, one PV per line (skip line starts with #), append each to pv_list")
-parser.add_argument('--from', dest='from_time',
-        help="A string of begin time in ISO8601 format")
-parser.add_argument('--to', dest='to_time',
-        help="A string of end time in ISO8601 format")
-parser.add_argument('--use-json', action='store_true',
-        help="Fetch data in the form of JSON")
-parser.add_argument('--resample', dest='resample', default=None,
-        help="The offset string/object representing target conversion, e.g. '1S' for resample with 1 second")
-parser.add_argument('--verbose', '-v', action='count', default=0,
-        help="Verbosity level of the log output, 0: no output, 1(-v): output progress, 2(-vv): output progress with description. Set env 'ARCHAPPL_LOG_LEVEL' for more output messages.")
-parser.add_argument('--version', action='store_true',
-        help="Print out version info")
-parser.add_argument('-o', '--output', dest='output', default=None,
-        help="File path for output data, print to stdout if not defined")
-parser.add_argument('-f', '--output-format', dest='fmt', default='csv',
-        help="File format for output data, supported: csv, hdf, excel, html, ...")
-parser.add_argument('--format-args', dest='fmt_args', type=json.loads, default='{}',
-        help='''Additional arguments passed to data export function in the form of dict, e.g. '{"key":"data"}' (for hdf format)''')
-parser.add_argument('--log-file', dest='logfile', default=None,
-        help="File path for log messages, print to stdout if not defined.")
-parser.add_argument('--last-n', '-n', dest='last_n', type=int, default=0,
-                    help="Define the maximum number of most recent samples for each PV.")
-
-parser.epilog = \
+
+EPILOG = \
 """
 Examples:
 # Retrieve raw PV data in the defined time frame
@@ -85,17 +63,60 @@ $ {n} -vv --pv-file pvlist.txt \\
   The following time strings with different timezones define the same time:
   2021-04-15T21:25:00.000Z (GMT)
   2021-04-15T17:25:00.00-04:00 (America/New_York)
-""".format(n=os.path.basename(sys.argv[0]))
+"""
 
 
-def main():
-    args = parser.parse_args(sys.argv[1:])
+def _make_parser(name: str) -> argparse.ArgumentParser:
+    # build the argument parser, *name* is the command name shown in the examples
+    parser = argparse.ArgumentParser(
+            description="Retrieve data from Archiver Appliance and export as a file.",
+            formatter_class=Formatter,
+            epilog=EPILOG.format(n=name))
+    parser.add_argument('--url', dest='url', default=None,
+            help="URL of Archiver Appliance, defaults to the one defined in site configuration file.")
+    parser.add_argument('--pv', action='append', dest='pv_list',
+            help="List of PVs for retrieval, each define with --pv")
+    parser.add_argument('--pv-file', dest='pv_file', default=None,
+            help="A file for PVs, one PV per line (skip line starts with #), append each to pv_list")
+    parser.add_argument('--from', dest='from_time',
+            help="A string of begin time in ISO8601 format")
+    parser.add_argument('--to', dest='to_time',
+            help="A string of end time in ISO8601 format")
+    parser.add_argument('--use-json', action='store_true',
+            help="Fetch data in the form of JSON")
+    parser.add_argument('--resample', dest='resample', default=None,
+            help="The offset string/object representing target conversion, e.g. '1S' for resample with 1 second")
+    parser.add_argument('--verbose', '-v', action='count', default=0,
+            help="Verbosity level of the log output, 0: no output, 1(-v): output progress, 2(-vv): output progress with description. Set env 'ARCHAPPL_LOG_LEVEL' for more output messages.")
+    parser.add_argument('--version', action='store_true',
+            help="Print out version info")
+    parser.add_argument('-o', '--output', dest='output', default=None,
+            help="File path for output data, print to stdout if not defined")
+    parser.add_argument('-f', '--output-format', dest='fmt', default='csv',
+            help="File format for output data, supported: csv, hdf, excel, html, ...")
+    parser.add_argument('--format-args', dest='fmt_args', type=_json.loads, default='{}',
+            help='''Additional arguments passed to data export function in the form of dict, e.g. '{"key":"data"}' (for hdf format), '''
+                 '''by default, csv is written in chunks of 100000 rows, hdf is written blosc compressed (level 5)''')
+    parser.add_argument('--log-file', dest='logfile', default=None,
+            help="File path for log messages, print to stdout if not defined.")
+    parser.add_argument('--last-n', '-n', dest='last_n', type=int, default=0,
+                        help="Define the maximum number of most recent samples for each PV.")
+    return parser
 
-    if args.version:
+
+def main():
+    # print the version without building the parser
+    if '--version' in sys.argv[1:]:
         from archappl import __version__
         print(f"Current version of pyarchappl is: {__version__}")
         sys.exit(0)
 
+    parser = _make_parser(os.path.basename(sys.argv[0]))
+    args = parser.parse_args(sys.argv[1:])
+
+    from archappl.client import ArchiverDataClient
+    from archappl.contrib import get_dataset_with_pvs
+
     # log file
     if args.logfile is not None:
         _handler = logging.FileHandler(args.logfile)
@@ -116,25 +137,12 @@ def main():
     else:
         _LOGGER.info(f"Fetch data from {args.from_time} to {args.to_time}")
 
-    # pv list
-    if args.pv_list is None:
-        pv_list = []
-    else:
-        pv_list = args.pv_list
-        _LOGGER.info(f"Defined {len(pv_list)} PVs via '--pv'")
+    # pv list, one request per PV, the duplicates are dropped
     try:
-        with open(args.pv_file, "r") as fp:
-            i = 0
-            for line in fp:
-                if line.startswith("#"):
-                    continue
-                if line.strip() not in pv_list:
-                    pv_list.append(line.strip())
-                    i += 1
-    except:
-        pass
-    else:
-        _LOGGER.info(f"Read {i} PVs from '{args.pv_file}'")
+        pv_list = get_pv_list(args.pv_list, args.pv_file)
+    except FileNotFoundError:
+        _LOGGER.error(f"PV file '{args.pv_file}' does not exist.")
+        sys.exit(1)
     if not pv_list:
         parser.print_help()
         sys.exit(1)
@@ -170,6 +178,10 @@ def main():
                 if 'key' not in args.fmt_args:
                     args.fmt_args['key'] = 'data'
                     _LOGGER.info("Set 'key' to 'data' by default for HDF format, see '--format-args'")
+                for k, v in HDF_DEFAULT_ARGS.items():
+                    args.fmt_args.setdefault(k, v)
+            elif args.fmt == 'csv':
+                args.fmt_args.setdefault('chunksize', CSV_CHUNKSIZE)
             getattr(dset, attr_fmt)(output, **args.fmt_args)
         else:
             _LOGGER.info(f"{args.fmt}: not supported export function.")
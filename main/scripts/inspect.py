@@ -6,22 +6,21 @@
 
 import logging
 import sys
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Callable, Union
 
-from .utils import SimpleNamespaceEncoder
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-_LOGGER = logging.getLogger(__name__)
+from .utils import dump
+from .utils import dumps
+from .utils import get_pv_list
+from .utils import to_serializable
 
-try:
-    from archappl.client import ArchiverMgmtClient
-except ImportError:
-    _LOGGER.warning("This command is disabled.")
-    sys.exit(1)
+_LOGGER = logging.getLogger(__name__)
 
 import argparse
-import json
 import os
 
 VALID_INFO_KEYS = ('status', 'type', 'details', 'stores')
@@ -30,29 +29,7 @@ class Formatter(argparse.ArgumentDefaultsHelpFormatter, argparse.RawDescriptionH
     pass
 
 
-parser = argparse.ArgumentParser(
-        description="Inspect Archiver Appliance w/ or w/o PVs.",
-        formatter_class=Formatter)
-parser.add_argument('--url', dest='url', default=None,
-        help="URL of Archiver Appliance, defaults to the one defined in site configuration file.")
-parser.add_argument('--pv', action='append', dest='pv_list',
-        help="List of PVs for inspection, each define with --pv")
-parser.add_argument('--pv-file', dest='pv_file', default=None,
-        help="A file for PVs, one PV per line (skip lines start with #), append each to pv_list")
-parser.add_argument('--key', dest='key', default='status',
-        help="Define the kind of information to inspect: 'status' (default), 'type', 'details', 'stores'")
-parser.add_argument('--sub-keys', dest='sub_keys', default=None,
-                    help="Define the sub-level keys separated with ',' to inspect if applicable.")
-parser.add_argument('--version', action='store_true',
-                    help="Print out version info")
-parser.add_argument('--info', action='store_true',
-                    help="Print out the info of archiver appliance")
-parser.add_argument('--log-file', dest='logfile', default=None,
-                    help="File path for log messages, print to stdout if not defined.")
-parser.add_argument('-o', '--output', dest='output', default=None,
-                    help="File path for output data, print to stdout if not defined")
-
-parser.epilog = \
+EPILOG = \
 """
 Examples:
 # Check if a PV is being archived or not
@@ -62,18 +39,59 @@ $ {n} --pv TST:constant --pv TST:NONEXIST --sub-keys pvName,status
 # Output the results to a file
 $ {n} --pv TST:constant --pv TST:uniformNoise --key details --output details.xlsx
 $ {n} --pv TST:constant --pv TST:uniformNoise --key type --output type.json
-""".format(n=os.path.basename(sys.argv[0]))
+"""
+
+
+def _make_parser(name: str) -> argparse.ArgumentParser:
+    # build the argument parser, *name* is the command name shown in the examples
+    parser = argparse.ArgumentParser(
+            description="Inspect Archiver Appliance w/ or w/o PVs.",
+            formatter_class=Formatter,
+            epilog=EPILOG.format(n=name))
+    parser.add_argument('--url', dest='url', default=None,
+            help="URL of Archiver Appliance, defaults to the one defined in site configuration file.")
+    parser.add_argument('--pv', action='append', dest='pv_list',
+            help="List of PVs for inspection, each define with --pv")
+    parser.add_argument('--pv-file', dest='pv_file', default=None,
+            help="A file for PVs, one PV per line (skip lines start with #), append each to pv_list")
+    parser.add_argument('--key', dest='key', default='status',
+            help="Define the kind of information to inspect: 'status' (default), 'type', 'details', 'stores'")
+    parser.add_argument('--sub-keys', dest='sub_keys', default=None,
+                        help="Define the sub-level keys separated with ',' to inspect if applicable.")
+    parser.add_argument('--version', action='store_true',
+                        help="Print out version info")
+    parser.add_argument('--info', action='store_true',
+                        help="Print out the info of archiver appliance")
+    parser.add_argument('--log-file', dest='logfile', default=None,
+                        help="File path for log messages, print to stdout if not defined.")
+    parser.add_argument('-o', '--output', dest='output', default=None,
+                        help="File path for output data, print to stdout if not defined")
+    parser.add_argument('--compact', action='store_true',
+                        help="Output JSON without indentation, smaller and faster to write")
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help="Do not cache the type info, details and stores of PVs")
+    parser.add_argument('--parallel', dest='parallel', type=int, default=16,
+                        help="The maximum number of concurrent requests for the list of PVs")
+    return parser
 
 
 def main():
     _LOGGER.info("Executing pyarchappl-inspect ...")
-    args = parser.parse_args(sys.argv[1:])
-
-    if args.version:
+    # print the version without building the parser
+    if '--version' in sys.argv[1:]:
         from archappl import __version__
         print(f"Current version of pyarchappl is: {__version__}")
         sys.exit(0)
 
+    parser = _make_parser(os.path.basename(sys.argv[0]))
+    args = parser.parse_args(sys.argv[1:])
+
+    try:
+        from archappl.client import ArchiverMgmtClient
+    except ImportError:
+        _LOGGER.warning("This command is disabled.")
+        sys.exit(1)
+
     # log file
     if args.logfile is not None:
         _handler = logging.FileHandler(args.logfile)
@@ -87,36 +105,28 @@ def main():
         _LOGGER.info(f"Writing log messages to {args.logfile}")
 
     # client
-    if args.url is None:
-        client = ArchiverMgmtClient()
-    else:
-        client = ArchiverMgmtClient(url=args.url)
+    client = ArchiverMgmtClient(url=args.url, cache=not args.no_cache)
+    # pool enough connections for the concurrent requests, retry on connection errors
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(32, args.parallel),
+                          max_retries=Retry(total=3, backoff_factor=0.2))
+    session = client.get_session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    indent = None if args.compact else 2
 
     # Archiver Appliance info
     if args.info:
         _LOGGER.info("Getting Archiver Appliance info...")
-        print(json.dumps(client.get_appliance_info(), indent=2))
+        print(dumps(client.get_appliance_info(), indent=indent))
         sys.exit(0)
 
-    # pv list
-    if args.pv_list is None:
-        pv_list = []
-    else:
-        pv_list = args.pv_list
-        _LOGGER.info(f"Defined {len(pv_list)} PVs via '--pv'")
+    # pv list, one request per PV, the duplicates are dropped
     try:
-        with open(args.pv_file, "r") as fp:
-            i = 0
-            for line in fp:
-                if line.startswith("#"):
-                    continue
-                if line.strip() not in pv_list:
-                    pv_list.append(line.strip())
-                    i += 1
-    except:
-        pass
-    else:
-        _LOGGER.info(f"Read {i} PVs from '{args.pv_file}'")
+        pv_list = get_pv_list(args.pv_list, args.pv_file)
+    except FileNotFoundError:
+        _LOGGER.error(f"PV file '{args.pv_file}' does not exist.")
+        sys.exit(1)
     if not pv_list:
         parser.print_help()
         sys.exit(1)
@@ -132,14 +142,12 @@ def main():
         sub_keys = []
 
     if args.key == "status":
-        r = client.get_pv_status(pv_list)
-        s = _get_json_with_subkeys(r, sub_keys)
-        _print_json(s, args.output)
+        r = client.get_pv_status(pv_list, max_workers=args.parallel)
+        _print_json(_project_subkeys(r, sub_keys), args.output, indent)
     elif args.key == "type":
-        r_ = {pv: client.get_pv_type_info(pv) for pv in pv_list}
+        r_ = _fetch_all(client.get_pv_type_info, pv_list, args.parallel)
         r = {k: v for k, v in r_.items() if v is not None}
-        s = _get_json_with_subkeys(r, sub_keys)
-        _print_json(s, args.output)
+        _print_json(_project_subkeys(r, sub_keys), args.output, indent)
     elif args.key == "details":
         if args.output is not None:
             if Path(args.output).suffix != ".xlsx":
@@ -149,46 +157,61 @@ def main():
                 xlsx_file = args.output
         else:
             xlsx_file = None
-        r = [(pv, client.get_pv_details(pv)) for pv in pv_list]
+        r_ = _fetch_all(client.get_pv_details, pv_list, args.parallel)
+        r = [(k, v) for k, v in r_.items() if v is not None]
         if xlsx_file is not None:
             _LOGGER.info(f"Writing details to '{xlsx_file}' ...")
             _write_details_to_excel(xlsx_file, r)
         else:
             print(r)
     elif args.key == "stores":
-        r_ = {pv: client.get_stores_for_pv(pv) for pv in pv_list}
+        r_ = _fetch_all(client.get_stores_for_pv, pv_list, args.parallel)
         r = {k: v for k, v in r_.items() if v is not None}
-        s = _get_json_with_subkeys(r, sub_keys)
-        _print_json(s, args.output)
-
+        _print_json(_project_subkeys(r, sub_keys), args.output, indent)
 
-def _write_details_to_excel(output_path: str, r: list):
-    def get_sheet_name(pv_name: str):
-        return pv_name.replace(":", "-")
 
-    with pd.ExcelWriter(output_path) as writer:
-        for pv_name, df in r:
-            if df is None:
-                continue
-            df.to_excel(writer, sheet_name=get_sheet_name(pv_name))
+def _fetch_all(func: Callable, pv_list: list[str], workers: int) -> dict:
+    # call func for each PV concurrently, return a dict keyed by PV names, in order
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(zip(pv_list, executor.map(func, pv_list)))
 
 
-def _get_json_with_subkeys(d: dict, sub_keys: list[str], indent: int = 2) -> str:
-    s = json.dumps(d, indent=indent, cls=SimpleNamespaceEncoder)
-    if sub_keys:
-        d = json.loads(s)
-        d1 = {k: {ik: v.get(ik, "N/A") for ik in sub_keys}
-              for k, v in d.items()}
-        return json.dumps(d1, indent=indent)
-    else:
-        return s
+def _write_details_to_excel(output_path: str, r: list):
+    from openpyxl import Workbook
 
+    def get_sheet_name(pv_name: str):
+        return pv_name.replace(":", "-")
 
-def _print_json(s: str, outfile: Union[str, None] = None):
+    # write-only mode streams the rows to the file instead of keeping
+    # all the cells of all the sheets in memory
+    wb = Workbook(write_only=True)
+    for pv_name, df in r:
+        ws = wb.create_sheet(title=get_sheet_name(pv_name))
+        # one header row with the index names, then plain tuples for rows
+        ws.append([*df.index.names, *map(str, df.columns)])
+        for row in df.reset_index().itertuples(index=False, name=None):
+            ws.append(row)
+    wb.save(output_path)
+
+
+def _project_subkeys(d: dict, sub_keys: list[str]) -> dict:
+    if not sub_keys:
+        return d
+    # project on the objects directly, serialize only once
+    d1 = {}
+    for k, v in d.items():
+        v = to_serializable(v)
+        d1[k] = {ik: v.get(ik, "N/A") for ik in sub_keys}
+    return d1
+
+
+def _print_json(d: dict, outfile: Union[str, None] = None, indent: Union[int, None] = 2):
     if outfile is not None:
         _LOGGER.info(f"Writing output to '{outfile}' ...")
-        with open(outfile, "w") as fp:
-            fp.write(s)
+        with open(outfile, "wb") as fp:
+            dump(d, fp, indent=indent)
     else:
         _LOGGER.info("Printing output ...")
-        print(s, end="", file=sys.stdout)
+        sys.stdout.flush()
+        dump(d, sys.stdout.buffer, indent=indent)
+        sys.stdout.buffer.flush()
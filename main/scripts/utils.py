@@ -1,9 +1,86 @@
 import json
+import logging
+import re
+from pathlib import Path
 from types import SimpleNamespace
+from typing import Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class SimpleNamespaceEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, SimpleNamespace):
-            return vars(obj)
-        return super().default(obj)
+_LOGGER = logging.getLogger(__name__)
+
+
+def to_serializable(obj):
+    """Default hook for JSON serialization of SimpleNamespace and the objects
+    with a *to_dict* method, e.g. PVStatus, only called for the objects the
+    encoder does not support natively.
+    """
+    # duck-typed, so that the data-only scripts do not import archappl.admin
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if isinstance(obj, SimpleNamespace):
+        return vars(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# a PV name per line, leading/trailing spaces are stripped, blank lines and
+# the ones start with '#' are skipped
+_PV_LINE = re.compile(rb'(?m)^[ \t]*([^#\s][^\r\n]*?)[ \t]*\r?$')
+
+
+def read_pv_file(path: str) -> list[str]:
+    """Read the PV names from a file, one PV per line, skip the blank lines
+    and the ones start with '#'.
+    """
+    data = Path(path).read_bytes()
+    return [m.decode() for m in _PV_LINE.findall(data)]
+
+
+def get_pv_list(pv_list: Union[list[str], None],
+                pv_file: Union[str, None] = None) -> list[str]:
+    """Return the PVs defined with --pv followed by the ones read from the
+    PV file (if defined), duplicated names are dropped, in order.
+
+    Raises FileNotFoundError if the PV file does not exist.
+    """
+    pvs = [] if pv_list is None else list(pv_list)
+    if pvs:
+        _LOGGER.info(f"Defined {len(pvs)} PVs via '--pv'")
+    if pv_file is not None:
+        new_pvs = read_pv_file(pv_file)
+        _LOGGER.info(f"Read {len(new_pvs)} PVs from '{pv_file}'")
+        pvs.extend(new_pvs)
+    return list(dict.fromkeys(pvs))
+
+
+def _separators(indent: Union[int, None]) -> tuple[str, str]:
+    # no whitespace at all for the compact output, as orjson does
+    return (',', ': ') if indent else (',', ':')
+
+
+def dumps(d, indent: Union[int, None] = 2) -> str:
+    """Serialize *d* to a JSON string, with orjson if available.
+    """
+    if orjson is not None:
+        # orjson only supports indenting with 2 spaces
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(d, default=to_serializable, option=option).decode()
+    return json.dumps(d, indent=indent, separators=_separators(indent),
+                      default=to_serializable)
+
+
+def dump(d, fp, indent: Union[int, None] = 2):
+    """Serialize *d* as JSON to the binary file object *fp*, with orjson if
+    available, otherwise the encoded chunks are written as they are produced.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        fp.write(orjson.dumps(d, default=to_serializable, option=option))
+    else:
+        encoder = json.JSONEncoder(indent=indent, separators=_separators(indent),
+                                   default=to_serializable)
+        for chunk in encoder.iterencode(d):
+            fp.write(chunk.encode())
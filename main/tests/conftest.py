@@ -6,7 +6,7 @@ from archappl.client import ArchiverDataClient
 
 @pytest.fixture
 def get_local_mgmt_client():
-    from archappl.client import ArchiverMgmtClient
+    from archappl.admin import ArchiverMgmtClient
     return ArchiverMgmtClient(url="http://127.0.0.1:17666")
 
 
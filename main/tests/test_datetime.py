@@ -122,3 +122,21 @@ def test_standardize_datetime():
 
     assert d_str1 == standardize_datetime(T0_DST)[1]
     assert d_str1 == standardize_datetime(t0)[1]
+
+
+def test_func_parse_dt_epoch():
+    """Test `parse_dt()` returns seconds since Epoch.
+    """
+    tt0 = datetime_with_timezone(T0_DST)
+    t_epoch = parse_dt("after 1 hour", tt0, epoch=True)
+    assert t_epoch - tt0.timestamp() == 3600.0
+
+
+def test_func_parse_dt_repeated():
+    """Test `parse_dt()` with the same delta time string and different references.
+    """
+    dt_str = "1 hour and 30 mins before"
+    tt0 = datetime_with_timezone(T0_DST)
+    tt1 = datetime_with_timezone(T1_EST)
+    assert (tt0 - parse_dt(dt_str, tt0)).total_seconds() == 5400.0
+    assert (tt1 - parse_dt(dt_str, tt1)).total_seconds() == 5400.0
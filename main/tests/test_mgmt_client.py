@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import json
 import pytest
+from types import SimpleNamespace
 try:
     from archappl.client import ArchiverMgmtClient
 except ImportError:
@@ -84,4 +86,201 @@ def test_get_pv_details(get_local_mgmt_client,
 
     pv2 = get_local_pvs['Invalid']
     r2 = get_local_mgmt_client.get_pv_details(pv=pv2)
-    assert r2 is None
\ No newline at end of file
+    assert r2 is None
+
+
+class _Response:
+    # a stub of requests.Response for the JSON endpoints
+    def __init__(self, data, ok=True):
+        self.ok = ok
+        self.content = json.dumps(data).encode()
+        self.raw = SimpleNamespace(read=lambda decode_content=False: self.content)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def _stub_get(monkeypatch, client, responses: dict) -> list:
+    # stub session.get with the responses keyed by endpoint name, return the requested list
+    requested = []
+
+    def _get(url, params=None, **kws):
+        pv = params['pv']
+        requested.append((url.rsplit('/', 1)[-1], pv))
+        return _Response(responses[url.rsplit('/', 1)[-1]](pv))
+
+    monkeypatch.setattr(client.get_session(), "get", _get)
+    return requested
+
+
+def test_archive_pv_invalid_op(get_local_mgmt_client):
+    with pytest.raises(ValueError):
+        get_local_mgmt_client.archive_pv("TST:constant", op="delete")
+
+
+def test_mgmt_client_url(get_local_mgmt_client):
+    client = get_local_mgmt_client
+    assert client.url == "http://127.0.0.1:17666/mgmt/bpl"
+    client.url = "http://127.0.0.1:17665"
+    assert client.url == "http://127.0.0.1:17665/mgmt/bpl"
+
+
+def test_mgmt_client_session(get_local_mgmt_client):
+    with get_local_mgmt_client as client:
+        session = client.get_session()
+        assert session.get_adapter(client.url) is session.get_adapter("https://")
+
+
+def test_mgmt_client_cache(get_local_mgmt_client, monkeypatch):
+    client = get_local_mgmt_client
+    requested = _stub_get(monkeypatch, client, {
+        'getPVTypeInfo': lambda pv: {'pvName': pv, 'samplingPeriod': '1.0'},
+        'getStoresForPV': lambda pv: {'LTS': 'pb://localhost?name=LTS'},
+    })
+    r1 = client.get_pv_type_info('TST:constant')
+    r1.samplingPeriod = '2.0'
+    r2 = client.get_pv_type_info('TST:constant')
+    assert r2.samplingPeriod == '1.0'
+    client.get_stores_for_pv('TST:constant')
+    client.get_pv_type_info('TST:uniformNoise')
+    assert len(requested) == 3
+    client.invalidate('TST:constant')
+    assert list(client.cache_info()) == [(client.url + '/getPVTypeInfo', 'TST:uniformNoise')]
+    client.get_pv_type_info('TST:constant')
+    client.get_pv_type_info('TST:uniformNoise')
+    assert requested[3:] == [('getPVTypeInfo', 'TST:constant')]
+    client.invalidate()
+    assert not client.cache_info()
+
+
+def test_mgmt_client_cache_ttl(get_local_mgmt_client, monkeypatch):
+    import time
+    client = get_local_mgmt_client
+    requested = _stub_get(monkeypatch, client, {
+        'getPVTypeInfo': lambda pv: {'pvName': pv},
+    })
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    client.get_pv_type_info('TST:constant')
+    monkeypatch.setattr(time, "time", lambda: now + 59)
+    client.get_pv_type_info('TST:constant')
+    assert len(requested) == 1
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    client.get_pv_type_info('TST:constant')
+    assert len(requested) == 2
+
+
+def test_mgmt_client_no_cache(monkeypatch):
+    from archappl import admin
+    client = admin.ArchiverMgmtClient(url="http://127.0.0.1:17666", cache=False)
+    requested = _stub_get(monkeypatch, client, {
+        'getPVTypeInfo': lambda pv: {'pvName': pv},
+    })
+    client.get_pv_type_info('TST:constant')
+    client.get_pv_type_info('TST:constant')
+    assert len(requested) == 2
+    assert not client.cache_info()
+
+
+def test_pv_details_cache(get_local_mgmt_client, monkeypatch):
+    client = get_local_mgmt_client
+    requested = _stub_get(monkeypatch, client, {
+        'getPVDetails': lambda pv: [
+            {'source': 'mgmt', 'name': 'PV Name', 'value': pv},
+            {'source': 'pv', 'name': 'Channel Name', 'value': pv},
+        ],
+    })
+    df1 = client.get_pv_details('TST:constant')
+    df1.drop(('pv', 'Channel Name'), inplace=True)
+    df2 = client.get_pv_details('TST:constant')
+    assert len(requested) == 1
+    assert df2.loc[("mgmt", "PV Name"), "value"] == 'TST:constant'
+    assert len(df2) == 2
+
+
+def test_get_pv_status_max_workers(get_local_mgmt_client, monkeypatch):
+    import threading
+    client = get_local_mgmt_client
+    threads = set()
+
+    def _status(pv):
+        threads.add(threading.get_ident())
+        return [{'pvName': pv, 'status': 'Being archived'}]
+
+    _stub_get(monkeypatch, client, {'getPVStatus': _status})
+    r = client.get_pv_status(['TST:a', 'TST:b', 'TST:c'], max_workers=1)
+    assert list(r) == ['TST:a', 'TST:b', 'TST:c']
+    assert len(threads) == 1
+
+
+def test_aget_pv_status():
+    import asyncio
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+    from archappl import admin
+    pytest.importorskip('aiohttp')
+    queries = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            q = parse_qs(urlparse(self.path).query)
+            queries.append(q)
+            pv = q['pv'][0]
+            names = ['TST:a', 'TST:b'] if pv == 'TST:*' else [pv]
+            body = json.dumps([{'pvName': i, 'status': 'Being archived'} for i in names]).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = admin.ArchiverMgmtClient(url=f"http://127.0.0.1:{server.server_port}")
+        r = asyncio.run(client.aget_pv_status(['TST:*', 'TST:c'], reportDetails=True, limit=None))
+        assert list(r) == ['TST:a', 'TST:b', 'TST:c']
+        assert r['TST:c'].status == 'Being archived'
+        assert sorted(q['pv'][0] for q in queries) == ['TST:*', 'TST:c']
+        assert all(q['reportDetails'] == ['True'] and 'limit' not in q for q in queries)
+        r = asyncio.run(client.aget_pv_status('TST:c'))
+        assert list(r) == ['TST:c']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_archive_pv_batch(get_local_mgmt_client, monkeypatch):
+    client = get_local_mgmt_client
+    requested = []
+
+    def _post(url, json=None):
+        requested.append((url, json))
+        return SimpleNamespace(content=b'[]')
+
+    monkeypatch.setattr(client.get_session(), "post", _post)
+    client.archive_pv(["TST:a", "TST:b", "TST:a"], samplingperiod=2.0, policy=None)
+    client.archive_pv(["TST:a", "TST:b"], op="pause")
+    assert requested == [
+        (client.url + "/archivePV", [{'pv': "TST:a", 'samplingperiod': '2.0'},
+                                     {'pv': "TST:b", 'samplingperiod': '2.0'}]),
+        (client.url + "/pauseArchivingPV", ["TST:a", "TST:b"]),
+    ]
+
+
+def test_pv_status():
+    from archappl.admin import PVStatus
+    st1 = PVStatus(pvName="TST:constant", status="Being archived", newField=1)
+    st2 = PVStatus(pvName="TST:constant", status="Being archived", newField=1)
+    assert st1 == st2
+    assert st1.status == "Being archived"
+    assert st1.to_dict() == {'pvName': "TST:constant", 'status': "Being archived", 'newField': 1}
+    st2.status = "Paused"
+    assert st1 != st2
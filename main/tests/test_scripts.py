@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import json
+import pytest
+from types import SimpleNamespace
+
+from archappl.admin import PVStatus
+from archappl.scripts.utils import dump
+from archappl.scripts.utils import dumps
+from archappl.scripts.utils import get_pv_list
+from archappl.scripts.utils import read_pv_file
+
+
+def test_dumps():
+    d = {
+        'TST:constant': PVStatus(pvName='TST:constant', status='Being archived'),
+        'TST:uniformNoise': SimpleNamespace(pvName='TST:uniformNoise', DBRType='DBR_SCALAR_DOUBLE'),
+    }
+    s = dumps(d)
+    assert json.loads(s) == {
+        'TST:constant': {'pvName': 'TST:constant', 'status': 'Being archived'},
+        'TST:uniformNoise': {'pvName': 'TST:uniformNoise', 'DBRType': 'DBR_SCALAR_DOUBLE'},
+    }
+    assert s.startswith('{\n  "TST:constant"')
+    assert dumps(d, indent=None).startswith('{"TST:constant":{"pvName":"TST:constant"')
+
+
+def test_project_subkeys():
+    from archappl.scripts.inspect import _project_subkeys
+    d = {
+        'TST:constant': PVStatus(pvName='TST:constant', status='Being archived'),
+        'TST:uniformNoise': SimpleNamespace(pvName='TST:uniformNoise'),
+    }
+    assert _project_subkeys(d, ['status']) == {
+        'TST:constant': {'status': 'Being archived'},
+        'TST:uniformNoise': {'status': 'N/A'},
+    }
+
+
+def test_dump():
+    import io
+    d = {'TST:constant': PVStatus(pvName='TST:constant', status='Being archived')}
+    fp = io.BytesIO()
+    dump(d, fp)
+    assert fp.getvalue().decode() == dumps(d)
+
+
+def test_read_pv_file(tmp_path):
+    f = tmp_path / "pvs.txt"
+    f.write_bytes(b"# PV list\nTST:constant\n\n  TST:uniformNoise \r\n"
+                  b"  # skipped\nTST:constant\nTST:sine")
+    assert read_pv_file(f) == ['TST:constant', 'TST:uniformNoise', 'TST:constant', 'TST:sine']
+    assert get_pv_list(['TST:sine', 'TST:a', 'TST:a'], f) == [
+        'TST:sine', 'TST:a', 'TST:constant', 'TST:uniformNoise']
+    assert get_pv_list(None) == []
+    with pytest.raises(FileNotFoundError):
+        get_pv_list(None, tmp_path / "nonexist.txt")
+
+
+def test_get_hdf_object_column(tmp_path, monkeypatch):
+    import sys
+    import numpy as np
+    import pandas as pd
+    from archappl.scripts.get import main
+    # a scalar PV and a waveform PV, the latter is an object column
+    df = pd.DataFrame({
+        'TST:constant': [1.0, 2.0],
+        'TST:wf': [np.arange(3.0), np.arange(3.0) + 1],
+    }, index=pd.date_range('2021-04-15T20:10:00Z', periods=2, freq='S'))
+    monkeypatch.setitem(sys.modules, 'archappl.contrib',
+                        SimpleNamespace(get_dataset_with_pvs=lambda *args, **kws: df))
+    output = tmp_path / "data.h5"
+    monkeypatch.setattr(sys, 'argv', [
+        'pyarchappl-get', '--pv', 'TST:constant', '--pv', 'TST:wf',
+        '-f', 'hdf', '-o', str(output)])
+    main()
+    df1 = pd.read_hdf(output, key='data')
+    assert df1['TST:constant'].tolist() == [1.0, 2.0]
+    assert df1['TST:wf'].iloc[1].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_get_without_admin(config_dir):
+    import os
+    import subprocess
+    import sys
+    from archappl.config import ENV_CONFIG_PATH_NAME
+    # a config with the admin client disabled
+    env = {**os.environ, ENV_CONFIG_PATH_NAME: config_dir.joinpath("admin_disabled.ini").as_posix()}
+    code = "import sys, archappl.scripts.get; print('archappl.admin' in sys.modules)"
+    r = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert r.stdout.strip() == "False"
+
+
+def test_write_details_to_excel(tmp_path):
+    import pandas as pd
+    from openpyxl import load_workbook
+    from archappl.scripts.inspect import _write_details_to_excel
+
+    def _details(pv):
+        return pd.DataFrame({
+            'source': ['mgmt', 'pv'], 'name': ['PV Name', 'Channel Name'], 'value': [pv, pv],
+        }).set_index(['source', 'name'])
+
+    output = tmp_path / "details.xlsx"
+    _write_details_to_excel(output, [(pv, _details(pv)) for pv in ('TST:constant', 'TST:sine')])
+    wb = load_workbook(output)
+    assert wb.sheetnames == ['TST-constant', 'TST-sine']
+    assert list(wb['TST-sine'].values) == [
+        ('source', 'name', 'value'),
+        ('mgmt', 'PV Name', 'TST:sine'),
+        ('pv', 'Channel Name', 'TST:sine'),
+    ]
+
+
+def test_fetch_all():
+    from archappl.scripts.inspect import _fetch_all
+    pv_list = [f'TST:{i}' for i in range(10)]
+    r = _fetch_all(lambda pv: pv.lower() if pv != 'TST:3' else None, pv_list, 4)
+    assert list(r) == pv_list
+    assert r['TST:1'] == 'tst:1' and r['TST:3'] is None